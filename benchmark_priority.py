@@ -0,0 +1,55 @@
+import random  # Import random for reproducible passenger generation
+import time  # Import time for measuring simulation cost
+
+from lab7.cycle import CycleTrainSystem
+from lab7.engine import TrainSystem
+from lab7.passenger import Passenger
+from lab7.stats import percentile
+
+def run_cycle_policy(policy, stations, cycles, seed):
+    # Run the cycle engine without emergencies, so the passenger ordering decides the route, and return
+    # the travel times, counting still waiting passengers as censored
+    train_system = CycleTrainSystem(stations, policy=policy, rng=random.Random(seed), verbose=False,
+                                    emergency_rate=0)
+    for _ in range(cycles):
+        train_system.cycle_at_station()
+    waiting = train_system.passengers.queue
+    return train_system.travel_times + [train_system.current_time - p.request_time for p in waiting]
+
+def run_engine_policy(policy, stations, requests, seed):
+    # Replay random requests through the request-driven engine and return the time from boarding to
+    # arrival, counting passengers still on the train as censored
+    rng = random.Random(seed)
+    train_system = TrainSystem(stations, verbose=False, policy=policy)
+    for _ in range(requests):
+        start, destination = rng.sample(stations, 2)
+        train_system.add_passenger_request(Passenger(start, destination, rng.randint(1, requests // 2)))
+    train_system.run(max_time=requests * len(stations))
+    waiting = train_system.queued_in_order() + train_system.onboard_passengers
+    return train_system.travel_times + [train_system.current_time - p.boarding_time for p in waiting]
+
+def report(engine, policy, run):
+    # Time one policy over every seed and print its row of the table
+    seeds = range(5)  # Independent runs per policy
+    travel_times = []
+    start = time.perf_counter()
+    for seed in seeds:
+        travel_times.extend(run(policy, seed))
+    elapsed = time.perf_counter() - start
+    mean = sum(travel_times) / len(travel_times)
+    print(f"{engine:<9}{policy:<10}{mean:>10.2f}{percentile(travel_times, 0.5):>8}"
+          f"{percentile(travel_times, 0.99):>8}{max(travel_times):>8}{elapsed:>10.3f}")
+
+def main():
+    stations = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']  # A longer line makes starvation visible
+    cycles = 2000  # Simulated time cycles per cycle engine run
+    requests = 400  # Passenger requests per request-driven run
+
+    print(f"{'engine':<9}{'policy':<10}{'mean':>10}{'p50':>8}{'p99':>8}{'max':>8}{'seconds':>10}")
+    for policy in ('nearest', 'farthest', 'aging'):
+        report('cycle', policy, lambda policy, seed: run_cycle_policy(policy, stations, cycles, seed))
+    for policy in ('nearest', 'aging'):
+        report('request', policy, lambda policy, seed: run_engine_policy(policy, stations, requests, seed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# Shared core of the train simulation. Submodules are imported on first attribute access so
+# `import lab7` stays cheap for short-lived worker processes.
+import importlib
+
+_exports = {
+    'Passenger': 'passenger',
+    'Emergency': 'passenger',
+    'Node': 'stack',
+    'LinkedList': 'stack',
+    'Stack': 'stack',
+    'PriorityQueue': 'queues',
+    'AgingPriorityQueue': 'queues',
+    'RoutePlanner': 'route',
+    'TrainSystem': 'engine',
+    'CycleTrainSystem': 'cycle',
+    'percentile': 'stats',
+    'summarize': 'stats',
+}
+
+__all__ = sorted(_exports)
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module 'lab7' has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_exports[name]}', __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,237 @@
+# Non-interactive batch runner: python -m lab7 run [--trace FILE] [--cycles N] [--json] ...
+# and python -m lab7 shard CONFIG for several lines at once
+import argparse
+import json
+import random
+import sys
+
+DEFAULT_STATIONS = ['A', 'B', 'C', 'D']
+POLICIES = ['nearest', 'farthest', 'aging', 'lookahead']
+
+def positive_int(value):
+    # argparse type for counts and windows that must be at least 1
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+def parse_stations(values):
+    # Accept both `--stations A B C` and `--stations A,B,C`
+    stations = [station.strip().upper() for value in values for station in value.split(',') if station.strip()]
+    if len(stations) < 2 or len(set(stations)) != len(stations):
+        raise ValueError("stations must name at least two distinct stations")
+    return stations
+
+def load_trace(path, stations):
+    # One request per line: `<request time> <start> <destination> [E]`, E marks an emergency.
+    # Blank lines and lines starting with # are ignored.
+    from .passenger import Emergency, Passenger
+
+    requests = []
+    with open(path) as trace:
+        for line_number, line in enumerate(trace, 1):
+            fields = line.split('#', 1)[0].split()
+            if not fields:
+                continue
+            if len(fields) not in (3, 4) or (len(fields) == 4 and fields[3].upper() not in ('E', 'EMERGENCY')):
+                raise ValueError(f"{path}:{line_number}: expected '<time> <start> <destination> [E]'")
+            try:
+                request_time = int(fields[0])
+            except ValueError:
+                raise ValueError(f"{path}:{line_number}: request time must be an integer") from None
+            start_station, destination_station = fields[1].upper(), fields[2].upper()
+            if start_station not in stations or destination_station not in stations:
+                raise ValueError(f"{path}:{line_number}: unknown station")
+            if start_station == destination_station:
+                raise ValueError(f"{path}:{line_number}: start and destination stations cannot be the same")
+            request_class = Emergency if len(fields) == 4 else Passenger
+            requests.append(request_class(start_station, destination_station, request_time))
+    return requests
+
+def run_trace(args, stations):
+    # Request-driven simulation; cycles bounds the simulated time
+    from .engine import TrainSystem
+    from .passenger import Emergency
+
+    train_system = TrainSystem(stations, verbose=args.verbose, metrics=args.metrics, policy=args.policy,
+                               aging_rate=args.aging_rate)
+    for request in load_trace(args.trace, stations):
+        if isinstance(request, Emergency):
+            train_system.add_emergency_request(request)
+        else:
+            train_system.add_passenger_request(request)
+    train_system.run(max_time=args.cycles)
+    unserved = (len(train_system.passenger_requests) + len(train_system.emergency_requests) +
+                len(train_system.passenger_queue) + len(train_system.onboard_passengers) +
+                len(train_system.onboard_emergencies))
+    carried = train_system.total_passengers - train_system.emergencies_handled
+    return train_system, carried, unserved
+
+def run_cycles(args, stations):
+    # Cycle-driven simulation with random passengers, reproducible through the seed
+    from .cycle import CycleTrainSystem
+
+    train_system = CycleTrainSystem(stations, policy=args.policy, aging_rate=args.aging_rate,
+                                    rng=random.Random(args.seed), verbose=args.verbose, metrics=args.metrics,
+                                    emergency_rate=args.emergency_rate)
+    for _ in range(args.cycles):
+        train_system.cycle_at_station()
+    unserved = len(train_system.passengers) + train_system.emergencies.stack.size
+    return train_system, len(train_system.travel_times), unserved
+
+def run(args):
+    from .stats import summarize
+
+    args.metrics = server = None
+    if args.metrics_port is not None:
+        from .metrics import LiveMetrics, serve_metrics
+
+        args.metrics = LiveMetrics(window=args.metrics_window)
+        try:
+            server = serve_metrics(args.metrics, port=args.metrics_port)
+        except OSError as error:
+            print(f"lab7 run: error: cannot serve metrics: {error}", file=sys.stderr)
+            return 2
+        print(f"Serving metrics on http://127.0.0.1:{server.server_address[1]}/metrics", file=sys.stderr)
+    try:
+        stations = parse_stations(args.stations)
+        if args.trace is not None and args.policy not in ('nearest', 'aging'):
+            raise ValueError("trace runs only support the 'nearest' and 'aging' policies")
+        if args.trace is not None:
+            train_system, carried, unserved = run_trace(args, stations)
+        else:
+            if args.seed is None:
+                args.seed = random.randrange(2 ** 32)  # Record the seed so the run can be repeated
+            train_system, carried, unserved = run_cycles(args, stations)
+    except (OSError, ValueError) as error:
+        print(f"lab7 run: error: {error}", file=sys.stderr)
+        return 2
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    summary = {
+        'mode': 'trace' if args.trace is not None else 'cycles',
+        'trace': args.trace,
+        'stations': stations,
+        'policy': args.policy,
+        'seed': args.seed,
+        'cycles': args.cycles,
+        'final_time': train_system.current_time,
+        'passengers_carried': carried,
+        'emergencies_handled': train_system.emergencies_handled,
+        'unserved': unserved,
+        'travel_time': summarize(train_system.travel_times),
+    }
+    if getattr(train_system, 'route_cache', None) is not None:
+        summary['route_cache'] = train_system.route_cache.stats()
+    travel_time = summary['travel_time']
+    write_summary(args, summary, [
+        f"Mode: {summary['mode']}, policy: {summary['policy']}, seed: {summary['seed']}",
+        f"Final time: {summary['final_time']}",
+        f"Passengers carried: {summary['passengers_carried']}, emergencies handled: "
+        f"{summary['emergencies_handled']}, unserved: {summary['unserved']}",
+        f"Travel time mean: {travel_time['mean']}, p50: {travel_time['p50']}, "
+        f"p99: {travel_time['p99']}, max: {travel_time['max']}",
+    ])
+    return 0
+
+def load_lines(path):
+    # {"lines": {"red": ["A", "B", ...], ...}, "interchanges": [["red", "B", "blue", "F"], ...]}
+    with open(path) as config_file:
+        try:
+            config = json.load(config_file)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"{path}: {error}") from None
+    if not isinstance(config, dict) or not isinstance(config.get('lines'), dict):
+        raise ValueError(f"{path}: expected an object with a 'lines' object")
+    lines = {name: parse_stations(stations) for name, stations in config['lines'].items()}
+    interchanges = config.get('interchanges', [])
+    if any(not isinstance(pair, list) or len(pair) != 4 for pair in interchanges):
+        raise ValueError(f"{path}: each interchange is [line, station, other line, other station]")
+    return lines, [(line, station.upper(), other_line, other_station.upper())
+                   for line, station, other_line, other_station in interchanges]
+
+def shard(args):
+    from .sharded import simulate_lines
+
+    try:
+        lines, interchanges = load_lines(args.config)
+        if args.seed is None:
+            args.seed = random.randrange(2 ** 32)  # Record the seed so the run can be repeated
+        summary = simulate_lines(lines, interchanges, args.cycles, sync_interval=args.sync_interval,
+                                 seed=args.seed, processes=not args.in_process, policy=args.policy,
+                                 aging_rate=args.aging_rate, emergency_rate=args.emergency_rate,
+                                 transfer_rate=args.transfer_rate)
+    except (OSError, ValueError, RuntimeError) as error:  # RuntimeError: a line worker died
+        print(f"lab7 shard: error: {error}", file=sys.stderr)
+        return 2
+
+    summary['policy'] = args.policy
+    text = [f"Lines: {len(summary['lines'])}, policy: {args.policy}, seed: {summary['seed']}, "
+            f"{summary['seconds']:.2f} s",
+            f"Passengers carried: {summary['passengers_carried']}, transfers: {summary['transfers']}"]
+    for name, line in summary['lines'].items():
+        text.append(f"{name}: carried {line['passengers_carried']}, transfers out {line['transfers_out']}, "
+                    f"in {line['transfers_in']}, travel time p99 {line['travel_time']['p99']}")
+    write_summary(args, summary, text)
+    return 0
+
+def write_summary(args, summary, text_lines):
+    if args.json:
+        output = json.dumps(summary, indent=2 if args.output is None else None)
+    else:
+        output = '\n'.join(text_lines)
+    if args.output is None:
+        print(output)
+    else:
+        with open(args.output, 'w') as summary_file:
+            summary_file.write(output + '\n')
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m lab7', description="Train simulation batch runner")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="run one simulation headless and print a summary")
+    run_parser.add_argument('--trace', help="request file, one '<time> <start> <destination> [E]' per line; "
+                                            "without it passengers are generated randomly every cycle")
+    run_parser.add_argument('--stations', nargs='+', default=DEFAULT_STATIONS,
+                            help="station names in line order (default: A B C D)")
+    run_parser.add_argument('--cycles', type=int, default=10,
+                            help="cycles to simulate; for traces, the time limit (default: 10)")
+    run_parser.add_argument('--policy', choices=POLICIES, default='nearest', help="passenger ordering")
+    run_parser.add_argument('--aging-rate', type=float, default=1, help="priority gained per waiting cycle")
+    run_parser.add_argument('--emergency-rate', type=float, default=1,
+                            help="chance of a new emergency each cycle (default: 1)")
+    run_parser.add_argument('--seed', type=int, help="random seed for generated passengers (default: chosen and reported)")
+    run_parser.add_argument('--json', action='store_true', help="print the summary as JSON")
+    run_parser.add_argument('--output', '-o', help="write the summary to this file instead of stdout")
+    run_parser.add_argument('--verbose', action='store_true', help="print every simulation event")
+    run_parser.add_argument('--metrics-port', type=int,
+                            help="serve live metrics on http://127.0.0.1:PORT/metrics while running (0 picks a port)")
+    run_parser.add_argument('--metrics-window', type=positive_int, default=60,
+                            help="rolling window of the live metrics, in simulated time units (default: 60)")
+    run_parser.set_defaults(handler=run)
+
+    shard_parser = commands.add_parser('shard', help="run several lines with transfers, one process per line")
+    shard_parser.add_argument('config', help="JSON file with 'lines' and 'interchanges'")
+    shard_parser.add_argument('--cycles', type=int, default=1000, help="cycles to simulate (default: 1000)")
+    shard_parser.add_argument('--sync-interval', type=int, default=10,
+                              help="cycles between transfer exchanges (default: 10)")
+    shard_parser.add_argument('--policy', choices=POLICIES, default='aging',
+                              help="passenger ordering (default: aging, which keeps transfer passengers moving)")
+    shard_parser.add_argument('--aging-rate', type=float, default=1, help="priority gained per waiting cycle")
+    shard_parser.add_argument('--emergency-rate', type=float, default=1,
+                              help="chance of a new emergency each cycle (default: 1)")
+    shard_parser.add_argument('--transfer-rate', type=float, default=0.2,
+                              help="chance each cycle of an extra passenger bound for another line (default: 0.2)")
+    shard_parser.add_argument('--seed', type=int, help="random seed (default: chosen and reported)")
+    shard_parser.add_argument('--in-process', action='store_true', help="run every line in this process")
+    shard_parser.add_argument('--json', action='store_true', help="print the summary as JSON")
+    shard_parser.add_argument('--output', '-o', help="write the summary to this file instead of stdout")
+    shard_parser.set_defaults(handler=shard)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    sys.exit(args.handler(args))
@@ -0,0 +1,187 @@
+import random  # Import random for generating random destinations
+
+from .passenger import Passenger
+from .queues import AgingPriorityQueue, PriorityQueue
+from .route import RouteCache, plan_direction
+from .stack import Stack
+
+# Cycle-driven train system: passengers and emergencies are generated at the train's station every cycle
+class CycleTrainSystem:
+    def __init__(self, stations, policy='nearest', aging_rate=1, rng=None, verbose=True, metrics=None,
+                 route_cache=None, emergency_rate=1):
+        self.stations = stations                    # List of stations in the train system
+        self.verbose = verbose                      # Print every event; batch runs turn this off
+        self.metrics = metrics                      # Optional LiveMetrics updated as events happen
+        self.rng = rng if rng is not None else random  # Random source, pass random.Random(seed) for reproducible runs
+        self.policy = policy                        # 'nearest', 'farthest', 'aging' or 'lookahead' routing
+        if policy == 'aging':
+            self.passengers = AgingPriorityQueue(stations, aging_rate)  # Aging queue for regular passengers
+        elif policy == 'lookahead':
+            self.passengers = AgingPriorityQueue(stations, 0)  # Only the per-destination buckets are needed
+        else:
+            self.passengers = PriorityQueue()       # Priority queue for regular passengers
+        self.emergency_rate = emergency_rate        # Chance of a new emergency each cycle
+        self.route_cache = None                     # Memoized look-ahead plans, shareable between runs
+        if policy == 'lookahead':
+            self.route_cache = route_cache if route_cache is not None else RouteCache()
+        self.emergencies = Stack()                  # Stack for emergency passengers
+        self.current_time = 0                       # Simulation current time
+        self.train_location = self.stations[0]      # Train starts at the first station
+        self.train_direction = 1                    # Direction the train is moving (1 for forward, -1 for reverse)
+        self.carry_count = 0                        # Total number of passengers carried
+        self.total_travel = 0                       # Total travel time of all passengers
+        self.travel_times = []                      # Travel time of every passenger dropped off
+        self.emergencies_handled = 0                # Number of emergency passengers dropped off
+
+    def passenger_priority(self, destination_station):
+        # Priority is determined by the distance between stations ('farthest' serves long trips first)
+        distance = abs(self.stations.index(self.train_location) - self.stations.index(destination_station))
+        return -distance if self.policy == 'farthest' else distance
+
+    def update_priorities(self):
+        # Recalculate priorities for onboard passengers based on the new train location
+        if self.policy in ('aging', 'lookahead'):
+            self.passengers.advance(self.train_location, self.current_time)  # Aging queue needs no re-keying
+            return
+        for passenger in self.passengers.queue:
+            passenger.priority = self.passenger_priority(passenger.destination_station)
+        self.passengers.heapify()  # Rebuild the heap after updating priorities
+
+    def generate_new_passengers(self):
+        # Generate a new passenger at the current station with a random destination
+        destination_station = self.rng.choice(self.stations)
+        while destination_station == self.train_location:
+            # Ensure the destination is not the current station
+            destination_station = self.rng.choice(self.stations)
+
+        # Priority is determined by the distance between stations
+        priority = self.passenger_priority(destination_station)
+
+        # Create a new passenger
+        new_passenger = Passenger(self.train_location, destination_station, self.current_time, priority)
+        self.passengers.push(new_passenger)  # Add the passenger to the priority queue
+        self.carry_count += 1  # Increment the carry count
+        if self.verbose:
+            print(f"New passenger from {self.train_location} to {destination_station} at time {self.current_time}")
+
+    def generate_new_emergencies(self):
+        # Generate a new emergency passenger at the current station
+        destination_station = self.rng.choice(self.stations)
+        while destination_station == self.train_location:
+            # Ensure the destination is not the current station
+            destination_station = self.rng.choice(self.stations)
+
+        # Emergency passengers have the highest priority (priority=0)
+        new_emergency = Passenger(self.train_location, destination_station, self.current_time, priority=0)
+        self.emergencies.push(new_emergency)  # Add the emergency passenger to the stack
+        self.carry_count += 1  # Increment the carry count
+        if self.verbose:
+            print(f"Emergency added for passenger from {self.train_location} to {destination_station} at time {self.current_time}")
+
+    def drop_off_passenger(self, passenger):
+        # Drop off a regular passenger at the current station
+        travel_time = self.current_time - passenger.request_time  # Calculate travel time
+        self.total_travel += travel_time  # Add to total travel time
+        self.travel_times.append(travel_time)  # Keep the individual travel time for percentiles
+        if self.metrics is not None:
+            self.metrics.record_passenger(self.current_time, travel_time)
+        if self.verbose:
+            print(f"Passenger dropped off at {self.train_location}, travel time: {travel_time}")
+        self.passengers.remove(passenger)  # Remove passenger from the priority queue
+
+    def drop_off_passengers(self):
+        # Drop off every regular passenger whose destination is the current station
+        if self.policy == 'nearest':
+            while not self.passengers.empty() and self.passengers.peek().destination_station == self.train_location:
+                self.drop_off_passenger(self.passengers.peek())
+            return
+        # The head is not necessarily bound for this station, so look passengers up by destination
+        passenger = self.passengers.peek_destination(self.train_location)
+        while passenger is not None:
+            self.drop_off_passenger(passenger)
+            passenger = self.passengers.peek_destination(self.train_location)
+
+    def drop_off_emergency(self, passenger_node):
+        # Drop off an emergency passenger at the current station
+        travel_time = self.current_time - passenger_node.data.request_time  # Calculate travel time
+        self.total_travel += travel_time  # Add to total travel time
+        self.emergencies_handled += 1  # Count the delivered emergency
+        if self.metrics is not None:
+            self.metrics.record_emergency(self.current_time, travel_time)
+        if self.verbose:
+            print(f"Emergency dropped off at {self.train_location}, travel time: {travel_time}")
+        self.emergencies.stack.remove(passenger_node)  # Remove passenger node from the linked list stack
+
+    def determine_next_station(self):
+        # Determine the next station the train should go to
+        current_index = self.stations.index(self.train_location)  # Get current station index
+
+        # Prioritize emergencies first
+        if not self.emergencies.is_empty():
+            emergency_passenger = self.emergencies.peek()
+            destination_index = self.stations.index(emergency_passenger.destination_station)
+            # Determine direction towards the emergency passenger's destination
+            self.train_direction = destination_index - current_index
+            self.train_direction /= abs(self.train_direction)  # Normalize to -1 or 1
+            return self.stations[int(current_index + self.train_direction)]
+
+        # Next, consider regular passengers
+        if not self.passengers.empty() and self.policy == 'lookahead':
+            # Head for the order of visiting every pending destination with the least total waiting,
+            # the plan for a (station, pending destinations) state is looked up in the route cache
+            destination_mask = self.passengers.destination_mask
+            self.train_direction = self.route_cache.get(
+                (current_index, destination_mask), lambda: plan_direction(current_index, destination_mask))
+            return self.stations[current_index + self.train_direction]
+        if not self.passengers.empty():
+            next_passenger = self.passengers.peek()
+            destination_index = self.stations.index(next_passenger.destination_station)
+            # The nearest policy only drops off the head, so the new head can be bound for this station;
+            # it gets off on a later visit, meanwhile the train keeps moving as if it had no passengers
+            if destination_index != current_index:
+                # Determine direction towards the passenger's destination
+                self.train_direction = destination_index - current_index
+                self.train_direction /= abs(self.train_direction)  # Normalize to -1 or 1
+                return self.stations[int(current_index + self.train_direction)]
+
+        # If no passengers, move to the next station in current direction
+        if current_index == 0:
+            self.train_direction = 1  # Move forward if at the first station
+        elif current_index == len(self.stations) - 1:
+            self.train_direction = -1  # Reverse direction if at the last station
+        return self.stations[int(current_index + self.train_direction)]
+
+    def cycle_at_station(self):
+        # Simulate the train's actions at the current station
+        if self.verbose:
+            print(f"Time: {self.current_time}, Current Station: {self.train_location}")
+
+        # Generate new passengers and emergencies at the current station
+        self.generate_new_passengers()
+        if self.emergency_rate >= 1 or self.rng.random() < self.emergency_rate:
+            self.generate_new_emergencies()
+
+        # Drop off emergency passengers at the current station
+        emergency_node = self.emergencies.stack.head
+        while emergency_node:
+            next_node = emergency_node.next  # Keep track of next node before potentially removing current
+            if emergency_node.data.destination_station == self.train_location:
+                self.drop_off_emergency(emergency_node)
+            emergency_node = next_node  # Move to the next node
+
+        # Drop off regular passengers at the current station
+        self.drop_off_passengers()
+
+        self.update_priorities()
+        if self.metrics is not None:
+            self.metrics.observe_queues(self.current_time, len(self.passengers), self.emergencies.stack.size)
+
+        # Determine the next station to move to
+        next_station = self.determine_next_station()
+        self.train_location = next_station  # Update train location
+
+        self.current_time += 1  # Increment simulation time
+
+    def calculate_average(self):
+        # Calculate average travel time of all passengers
+        return self.total_travel / self.carry_count if self.carry_count > 0 else 0
@@ -0,0 +1,331 @@
+import heapq
+from bisect import bisect_right
+from collections import deque
+
+from .passenger import Passenger
+from .queues import AgingPriorityQueue
+from .route import RoutePlanner
+
+class TrainSystem:
+    def __init__(self, stations=None, verbose=True, metrics=None, policy='nearest', aging_rate=1):
+        self.stations = stations if stations is not None else ['A', 'B', 'C', 'D']
+        if policy not in ('nearest', 'aging'):
+            raise ValueError(f"unknown policy {policy!r}, expected 'nearest' or 'aging'")
+        self.policy = policy  # 'nearest' orders boarded passengers by distance, 'aging' also by waiting time
+        self.verbose = verbose  # Print every event; batch runs turn this off
+        self.metrics = metrics  # Optional LiveMetrics updated as events happen
+        self.passenger_requests = []
+        self.emergency_requests = []  # Heap of (request_time, sequence, emergency)
+        self.emergency_sequence = 0  # Keeps equal request times in insertion order
+        self.pending_emergencies = deque()  # Due emergencies released from the heap, not boarded yet
+        self.current_time = 1  # Start time from 1 instead of 0
+        self.train_location = self.stations[0]
+        # Boarded passengers waiting to be driven to their destination: a heap keyed on distance, or for
+        # the aging policy an AgingPriorityQueue where waiting since the request lowers the priority value
+        self.passenger_queue = AgingPriorityQueue(self.stations, aging_rate) if policy == 'aging' else []
+        self.onboard_passengers = []
+        self.onboard_emergencies = []
+        self.total_travel_time = 0
+        self.total_passengers = 0
+        self.travel_times = []  # Travel time of every passenger and emergency delivered
+        self.emergencies_handled = 0
+        self.current_target = None  # Station the train is currently driving to
+        self.route_planner = RoutePlanner(self.stations)
+        self.route_version = 0  # Bumped whenever the planned route may have changed
+        self.planned_route_state = None  # (time, location, version) the route planner was last updated for
+        self.queued_keys = []  # Queue keys of the queued passengers in the planned route, in route order
+        self.queue_offset = 0  # Planned waypoints before the first queued passenger, already committed to
+
+    def station_distance(self, start, end):
+        return abs(self.stations.index(start) - self.stations.index(end))
+
+    def calculate_priority(self, passenger):
+        passenger.priority = self.station_distance(self.train_location, passenger.destination_station)
+
+    def queue_passenger(self, passenger):
+        if self.policy == 'aging':
+            self.passenger_queue.push(passenger)
+        else:
+            self.calculate_priority(passenger)
+            heapq.heappush(self.passenger_queue, passenger)
+
+    def next_passenger(self):
+        # Remove and return the boarded passenger to drive to next
+        if self.policy == 'aging':
+            self.passenger_queue.advance(self.train_location, self.current_time)
+            return self.passenger_queue.pop()
+        return heapq.heappop(self.passenger_queue)
+
+    def update_priorities(self):
+        # Measure the priorities from the train's current location again
+        if self.policy == 'aging':
+            self.passenger_queue.advance(self.train_location, self.current_time)  # Aging queue needs no re-keying
+        else:
+            for passenger in self.passenger_queue:
+                self.calculate_priority(passenger)
+            heapq.heapify(self.passenger_queue)
+        self.route_changed()
+
+    def queue_key(self, passenger):
+        # Order of a queued passenger, the lowest key is driven to first
+        if self.policy == 'aging':
+            return (self.passenger_queue.effective_priority(passenger), passenger.request_time)
+        return passenger.priority
+
+    def queued_in_order(self):
+        # Queued passengers in the order they would be popped
+        if self.policy == 'aging':
+            self.passenger_queue.advance(self.train_location, self.current_time)
+            return sorted(self.passenger_queue.queue, key=self.queue_key)
+        heap = list(self.passenger_queue)  # Popping a copy keeps the heap's order among equal priorities
+        return [heapq.heappop(heap) for _ in range(len(heap))]
+
+    def add_passenger_request(self, passenger):
+        self.passenger_requests.append(passenger)
+        self.passenger_requests.sort(key=lambda x: x.request_time)
+
+    def add_emergency_request(self, emergency):
+        heapq.heappush(self.emergency_requests, (emergency.request_time, self.emergency_sequence, emergency))
+        self.emergency_sequence += 1
+
+    def emergency_due(self):
+        # O(1) check: the earliest emergency request sits at the top of the heap
+        return bool(self.emergency_requests) and self.emergency_requests[0][0] <= self.current_time
+
+    def due_emergency_count(self):
+        # Emergencies in the heap that are already due. Due entries form a subtree at the top of the heap,
+        # so only they and their direct children are looked at
+        count = 0
+        stack = [0] if self.emergency_requests else []
+        while stack:
+            index = stack.pop()
+            if self.emergency_requests[index][0] <= self.current_time:
+                count += 1
+                stack.extend(child for child in (2 * index + 1, 2 * index + 2)
+                             if child < len(self.emergency_requests))
+        return count
+
+    def waiting_emergencies(self):
+        # Emergencies that are due and not delivered yet
+        return self.due_emergency_count() + len(self.pending_emergencies) + len(self.onboard_emergencies)
+
+    def release_due_emergencies(self):
+        # Pop every emergency whose request_time <= current_time, earliest first
+        released = []
+        while self.emergency_due():
+            released.append(heapq.heappop(self.emergency_requests)[2])
+        return released
+
+    def route_changed(self):
+        self.route_version += 1
+
+    def set_target(self, station):
+        if self.current_target != station:
+            self.current_target = station
+            self.route_changed()
+
+    def planned_route(self, queued=None):
+        # Current target, then onboard emergencies and passengers, then queued passengers in priority order
+        route = [self.current_target] if self.current_target is not None else []
+        route.extend(e.destination_station for e in self.onboard_emergencies)
+        route.extend(p.destination_station for p in self.onboard_passengers)
+        route.extend(p.destination_station for p in (queued if queued is not None else self.queued_in_order()))
+        return route
+
+    def estimate_arrival(self, start, dest):
+        # Estimated arrival time at dest for a passenger boarding at start, following the planned route.
+        # Queued passengers only get off once they are driven to, so the new passenger's place in the
+        # queue decides how much of the route comes first
+        state = (self.current_time, self.train_location, self.route_version)
+        if state != self.planned_route_state:
+            queued = self.queued_in_order()
+            route = self.planned_route(queued)
+            self.route_planner.plan(self.train_location, self.current_time, route)
+            self.queued_keys = [self.queue_key(p) for p in queued]
+            self.queue_offset = len(route) - len(queued)  # Waypoints ahead of every queued passenger
+            self.planned_route_state = state
+        if self.policy == 'aging':
+            self.passenger_queue.advance(self.train_location, self.current_time)
+        passenger = Passenger(start, dest, self.current_time, self.station_distance(start, dest))
+        ahead = self.queue_offset + bisect_right(self.queued_keys, self.queue_key(passenger))
+        return self.route_planner.estimate_arrival(start, dest, self.current_time, ahead, self.queue_offset)
+
+    def get_next_station(self, destination):
+        current_index = self.stations.index(self.train_location)
+        dest_index = self.stations.index(destination)
+        if current_index < dest_index:
+            return self.stations[current_index + 1]
+        elif current_index > dest_index:
+            return self.stations[current_index - 1]
+        else:
+            return self.train_location
+
+    def move_train(self, destination):
+        next_station = self.get_next_station(destination)
+        if self.train_location != next_station:
+            self.train_location = next_station
+            if self.verbose:
+                print(f"Time {self.current_time}: Train moved to station {self.train_location}")
+
+    def process_boarding(self):
+        # Board passengers
+        passengers_to_board = [p for p in self.passenger_requests
+                               if p.start_station == self.train_location and p.request_time <= self.current_time]
+        for passenger in passengers_to_board:
+            passenger.boarding_time = self.current_time
+            self.queue_passenger(passenger)
+            if self.metrics is not None:
+                self.metrics.record_boarding(self.current_time, self.current_time - passenger.request_time)
+            self.passenger_requests.remove(passenger)
+            self.route_changed()
+            if self.verbose:
+                print(f"Time {self.current_time}: Passenger boarded at station {self.train_location} going to {passenger.destination_station}")
+        if self.metrics is not None:
+            self.metrics.observe_queues(self.current_time, len(self.passenger_queue), self.waiting_emergencies())
+
+    def process_alighting(self):
+        # Alight emergencies first
+        for emergency in self.onboard_emergencies[:]:
+            if emergency.destination_station == self.train_location:
+                emergency.arrival_time = self.current_time
+                self.onboard_emergencies.remove(emergency)
+                self.route_changed()
+                travel_time = emergency.arrival_time - emergency.boarding_time
+                self.total_travel_time += travel_time
+                self.total_passengers += 1
+                self.travel_times.append(travel_time)
+                self.emergencies_handled += 1
+                if self.metrics is not None:
+                    self.metrics.record_emergency(self.current_time, self.current_time - emergency.request_time)
+                if self.verbose:
+                    print(f"Time {self.current_time}: Emergency alighted at station {self.train_location}, travel time {travel_time}")
+
+        # Alight passengers
+        for passenger in self.onboard_passengers[:]:
+            if passenger.destination_station == self.train_location:
+                passenger.arrival_time = self.current_time
+                self.onboard_passengers.remove(passenger)
+                self.route_changed()
+                travel_time = passenger.arrival_time - passenger.boarding_time
+                self.total_travel_time += travel_time
+                self.total_passengers += 1
+                self.travel_times.append(travel_time)
+                if self.metrics is not None:
+                    self.metrics.record_passenger(self.current_time, self.current_time - passenger.request_time)
+                if self.verbose:
+                    print(f"Time {self.current_time}: Passenger alighted at station {self.train_location}, travel time {travel_time}")
+
+    def handle_emergencies(self):
+        # Emergencies leave the heap in request_time order, so the pending queue stays sorted
+        pending_emergencies = self.pending_emergencies
+        pending_emergencies.extend(self.release_due_emergencies())
+
+        while pending_emergencies or self.onboard_emergencies:
+            # Handle pending emergencies
+            if pending_emergencies:
+                # Pick the emergency with the earliest request time
+                emergency = pending_emergencies[0]
+                # Move train to the emergency's start station
+                self.set_target(emergency.start_station)
+                while self.train_location != emergency.start_station:
+                    self.current_time += 1
+                    self.move_train(emergency.start_station)
+                    self.process_alighting()
+                    self.process_boarding()
+                    # Check for new emergencies during movement
+                    pending_emergencies.extend(self.release_due_emergencies())
+
+                # Board the emergency
+                emergency.boarding_time = self.current_time
+                self.onboard_emergencies.append(emergency)
+                if self.metrics is not None:
+                    self.metrics.record_boarding(self.current_time, self.current_time - emergency.request_time)
+                self.route_changed()
+                pending_emergencies.popleft()
+                if self.verbose:
+                    print(f"Time {self.current_time}: Emergency boarded at station {self.train_location} going to {emergency.destination_station}")
+
+            # Deliver onboard emergencies
+            if self.onboard_emergencies:
+                emergency = self.onboard_emergencies[0]
+                # Move train to emergency's destination
+                self.set_target(emergency.destination_station)
+                while self.train_location != emergency.destination_station:
+                    self.current_time += 1
+                    self.move_train(emergency.destination_station)
+                    self.process_alighting()
+                    self.process_boarding()
+                    # Check for new emergencies during movement
+                    if self.emergency_due():
+                        pending_emergencies.extend(self.release_due_emergencies())
+                        break  # Break to handle new emergency
+
+                # Alight emergency if at destination
+                if self.train_location == emergency.destination_station:
+                    self.process_alighting()
+                    # Removed redundant time increment after alighting
+
+    def handle_passengers(self):
+        while self.passenger_queue or self.onboard_passengers:
+            if self.onboard_passengers:
+                passenger = self.onboard_passengers[0]
+            else:
+                passenger = self.next_passenger()
+                self.onboard_passengers.append(passenger)
+                self.route_changed()
+                if self.verbose:
+                    print(f"Time {self.current_time}: Handling passenger from {passenger.start_station} to {passenger.destination_station}")
+
+            # Move train to passenger's destination
+            self.set_target(passenger.destination_station)
+            while self.train_location != passenger.destination_station:
+                self.current_time += 1
+                # Before moving, check for new emergencies (preempts the current passenger)
+                if self.emergency_due():
+                    # Handle emergencies
+                    self.handle_emergencies()
+                    # Recalculate priorities after handling emergencies
+                    self.update_priorities()
+                    break  # Break to reprocess the passenger queue
+
+                self.move_train(passenger.destination_station)
+                self.process_alighting()
+                self.process_boarding()
+
+            # Check if passenger has alighted
+            if passenger not in self.onboard_passengers:
+                continue  # Passenger has already alighted
+
+            # Passenger alights
+            self.process_alighting()
+            # Removed redundant time increment after alighting
+
+    def pending(self):
+        return bool(self.passenger_requests or self.emergency_requests or self.onboard_passengers or
+                    self.onboard_emergencies or self.passenger_queue)
+
+    def run(self, max_time=None):
+        # Start simulation; max_time stops runs whose remaining requests can never be served
+        while self.pending() and (max_time is None or self.current_time <= max_time):
+
+            self.process_alighting()
+            self.process_boarding()
+
+            # Check for any new emergencies whose request_time <= current_time
+            if self.emergency_due() or self.onboard_emergencies:
+                self.handle_emergencies()
+                # Recalculate priorities after emergencies
+                self.update_priorities()
+            elif self.passenger_queue or self.onboard_passengers:
+                self.handle_passengers()
+            else:
+                # No one to handle, advance time
+                self.current_time += 1
+
+        if not self.verbose:
+            return
+        if self.total_passengers > 0:
+            average_travel_time = self.total_travel_time / self.total_passengers
+            print(f"\nAverage travel time: {average_travel_time}")
+        else:
+            print("No passengers or emergencies were processed.")
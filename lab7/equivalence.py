@@ -0,0 +1,188 @@
+# Differential harness: optimized engines must reproduce the frozen reference scripts exactly.
+# Each workload is run through the reference (the original Main.py and mainV4.py, kept in lab7/reference)
+# and every registered implementation; the printed event trace and the travel totals have to match.
+# Run with `python -m lab7.equivalence`, or through pytest (tests/test_equivalence.py).
+import contextlib
+import importlib
+import io
+import random
+import sys
+import time
+
+STATIONS = ['A', 'B', 'C', 'D']  # The reference request-driven engine only knows these stations
+TIME_LIMIT = 200  # Request-driven runs that cannot finish are cut off here
+
+_implementations = {'engine': {}, 'cycle': {}}
+
+class StepLimit(Exception):
+    pass
+
+def register(kind, name, factory):
+    # kind 'engine': factory(stations) -> object behaving like the reference Main.TrainSystem
+    # kind 'cycle': factory(stations, rng) -> object behaving like the reference mainV4.TrainSystem
+    _implementations[kind][name] = factory
+
+def reference_module(name):
+    # 'main' or 'mainv4', the frozen copies of the original scripts
+    return importlib.import_module(f'.reference.{name}', __package__)
+
+def register_defaults():
+    from .cycle import CycleTrainSystem
+    from .engine import TrainSystem
+
+    register('engine', 'lab7.engine', lambda stations: TrainSystem(stations))
+    # The reference only has the nearest-destination ordering; the other policies are covered by the
+    # queue tests in tests/test_queues.py
+    register('cycle', 'lab7.cycle', lambda stations, rng: CycleTrainSystem(stations, rng=rng))
+
+def _capture(simulate):
+    # Run simulate() and return (event lines, outcome, seconds); exceptions are part of the outcome
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        try:
+            outcome = simulate()
+        except StepLimit:
+            outcome = 'step limit'
+        except Exception as error:
+            outcome = f'raised {type(error).__name__}'
+    return output.getvalue().splitlines(), outcome, time.perf_counter() - start
+
+def run_engine(train_system, passenger_class, emergency_class, workload):
+    # workload: list of (request_time, start, destination, is_emergency)
+    for request_time, start, destination, is_emergency in workload:
+        if is_emergency:
+            train_system.add_emergency_request(emergency_class(start, destination, request_time))
+        else:
+            train_system.add_passenger_request(passenger_class(start, destination, request_time))
+    process_boarding = train_system.process_boarding
+
+    def guarded_boarding():
+        # Boarding runs on every idle tick, which makes it a reliable place to stop runaway runs
+        if train_system.current_time > TIME_LIMIT:
+            raise StepLimit()
+        process_boarding()
+
+    train_system.process_boarding = guarded_boarding
+
+    def simulate():
+        train_system.run()
+        return (train_system.total_travel_time, train_system.total_passengers, train_system.current_time)
+
+    return _capture(simulate)
+
+def run_cycle(train_system, cycles):
+    def simulate():
+        for _ in range(cycles):
+            train_system.cycle_at_station()
+        return (train_system.total_travel, train_system.carry_count, train_system.current_time)
+
+    return _capture(simulate)
+
+def check_engine(workload, timings=None):
+    # Compare every registered request-driven engine with the reference Main.py on one workload
+    reference = reference_module('main')
+    expected = run_engine(reference.TrainSystem(), reference.Passenger, reference.Emergency, workload)
+    from .passenger import Emergency, Passenger
+
+    for name, factory in _implementations['engine'].items():
+        actual = run_engine(factory(list(STATIONS)), Passenger, Emergency, workload)
+        _compare(name, workload, expected, actual, timings)
+
+def check_cycle(seed, stations, cycles, timings=None):
+    # Compare every registered cycle engine with the reference mainV4.py on one seeded run
+    reference = reference_module('mainv4')
+    random.seed(seed)  # mainV4 draws from the global random module
+    expected = run_cycle(reference.TrainSystem(stations), cycles)
+    for name, factory in _implementations['cycle'].items():
+        actual = run_cycle(factory(stations, random.Random(seed)), cycles)
+        _compare(name, (seed, stations, cycles), expected, actual, timings)
+
+def _compare(name, workload, expected, actual, timings):
+    expected_events, expected_outcome, reference_seconds = expected
+    actual_events, actual_outcome, seconds = actual
+    if actual_events != expected_events:
+        position = next((index for index, (a, b) in enumerate(zip(expected_events, actual_events)) if a != b),
+                        min(len(expected_events), len(actual_events)))
+        raise AssertionError(f"{name}: event trace differs from the reference at event {position} "
+                             f"for workload {workload!r}")
+    if actual_outcome != expected_outcome:
+        raise AssertionError(f"{name}: got {actual_outcome!r}, reference {expected_outcome!r} "
+                             f"for workload {workload!r}")
+    if timings is not None:
+        totals = timings.setdefault(name, [0.0, 0.0])
+        totals[0] += reference_seconds
+        totals[1] += seconds
+
+def workloads():
+    # Hypothesis strategy for check_engine: lists of (request_time, start, destination, is_emergency)
+    from hypothesis import strategies as st
+
+    @st.composite
+    def requests(draw):
+        start, destination = draw(st.permutations(STATIONS))[:2]
+        return (draw(st.integers(1, 20)), start, destination, draw(st.booleans()))
+
+    return st.lists(requests(), max_size=12)
+
+def cycle_runs():
+    # Hypothesis strategy for check_cycle: (seed, stations, cycles)
+    from hypothesis import strategies as st
+
+    stations = st.integers(2, 8).map(lambda count: [chr(ord('A') + index) for index in range(count)])
+    return st.tuples(st.integers(0, 2 ** 32 - 1), stations, st.integers(1, 80))
+
+def _hypothesis_checks(examples, timings):
+    from hypothesis import given, settings
+
+    @settings(max_examples=examples, deadline=None)
+    @given(workloads())
+    def engine_property(workload):
+        check_engine(workload, timings)
+
+    @settings(max_examples=examples, deadline=None)
+    @given(cycle_runs())
+    def cycle_property(run):
+        check_cycle(*run, timings)
+
+    engine_property()
+    cycle_property()
+
+def random_checks(examples, timings=None, seed=0):
+    # Same workload shapes as the Hypothesis strategies, drawn from a seeded generator
+    rng = random.Random(seed)
+    for _ in range(examples):
+        workload = []
+        for _ in range(rng.randint(0, 12)):
+            start, destination = rng.sample(STATIONS, 2)
+            workload.append((rng.randint(1, 20), start, destination, rng.random() < 0.5))
+        check_engine(workload, timings)
+        stations = [chr(ord('A') + index) for index in range(rng.randint(2, 8))]
+        check_cycle(rng.randrange(2 ** 32), stations, rng.randint(1, 80), timings)
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m lab7.equivalence',
+                                     description="Check registered engines against the frozen reference scripts")
+    parser.add_argument('--examples', type=int, default=200, help="workloads per property (default: 200)")
+    args = parser.parse_args(argv)
+
+    register_defaults()
+    timings = {}
+    try:
+        import hypothesis  # noqa: F401
+    except ImportError:
+        print("Hypothesis is not installed, using seeded random workloads instead")
+        random_checks(args.examples, timings)
+    else:
+        _hypothesis_checks(args.examples, timings)
+
+    print(f"{'implementation':<16}{'reference s':>14}{'fast s':>10}{'speedup':>10}")
+    for name, (reference_seconds, seconds) in sorted(timings.items()):
+        speedup = reference_seconds / seconds if seconds else float('inf')
+        print(f"{name:<16}{reference_seconds:>14.3f}{seconds:>10.3f}{speedup:>9.2f}x")
+    print("All implementations match the reference")
+
+if __name__ == "__main__":
+    sys.exit(main())
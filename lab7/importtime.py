@@ -0,0 +1,42 @@
+# Measures how long a fresh interpreter takes to import the simulation core, for worker start-up.
+# Run with `python -m lab7.importtime`; exits with status 1 when the budget is exceeded.
+import statistics
+import subprocess
+import sys
+
+CORE_MODULES = ['lab7.engine', 'lab7.cycle']
+HEAVY_MODULES = ['http.server', 'multiprocessing']  # Imported only by the features that need them
+BUDGET_MS = 50.0  # Median import time allowed for the core, on top of interpreter start-up
+
+_probe = """
+import sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = (time.perf_counter() - start) * 1000
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, ','.join(loaded))
+"""
+
+def measure(runs=7):
+    # Median import time in milliseconds over fresh interpreters, and any heavy modules that got loaded
+    timings = []
+    heavy_loaded = set()
+    code = _probe.format(modules=CORE_MODULES, heavy=HEAVY_MODULES)
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        elapsed, loaded = output.split(' ', 1)
+        timings.append(float(elapsed))
+        heavy_loaded.update(name for name in loaded.strip().split(',') if name)
+    return statistics.median(timings), sorted(heavy_loaded)
+
+def main():
+    elapsed, heavy_loaded = measure()
+    print(f"Core import time: {elapsed:.2f} ms (budget {BUDGET_MS:.0f} ms)")
+    if heavy_loaded:
+        print(f"Heavy modules imported eagerly: {', '.join(heavy_loaded)}")
+    if elapsed > BUDGET_MS or heavy_loaded:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# Live simulation metrics over a rolling window of simulated time, exposed in the Prometheus text
+# format. Recording an event is O(1); the HTTP server is only imported when serve_metrics() is called.
+import threading
+
+class RollingCounter:
+    # Sum of the amounts added during the last `window` time units, one ring buffer slot per time unit
+    def __init__(self, window):
+        if window < 1:
+            raise ValueError(f"window must be at least 1 time unit, got {window}")
+        self.window = window
+        self.slots = [0] * window
+        self.slot_times = [None] * window
+        self.latest = None  # Most recent time the window was advanced to
+        self.total = 0      # Sum over the live slots
+
+    def advance(self, time):
+        # Expire slots that fell out of the window; amortized O(1) per simulated time unit
+        if self.latest is not None and time <= self.latest:
+            return
+        start = time - self.window + 1 if self.latest is None else max(self.latest + 1, time - self.window + 1)
+        for expired_time in range(start, time + 1):
+            slot = expired_time % self.window
+            self.total -= self.slots[slot]
+            self.slots[slot] = 0
+            self.slot_times[slot] = expired_time
+        self.latest = time
+
+    def add(self, time, amount=1):
+        self.advance(time)
+        slot = time % self.window
+        if self.slot_times[slot] == time:  # Late events older than the window are dropped
+            self.slots[slot] += amount
+            self.total += amount
+
+class LiveMetrics:
+    def __init__(self, window=60):
+        if window < 1:
+            raise ValueError(f"window must be at least 1 time unit, got {window}")
+        self.window = window
+        self.lock = threading.Lock()  # The exporter thread reads while the simulation writes
+        self.passengers_carried = RollingCounter(window)
+        self.emergencies_handled = RollingCounter(window)
+        self.trip_time = RollingCounter(window)  # Summed request-to-arrival time of the deliveries in the window
+        self.deliveries = RollingCounter(window)  # Passengers and emergencies, the trip_time denominator
+        self.wait_time = RollingCounter(window)  # Summed request-to-boarding time of the boardings in the window
+        self.boardings = RollingCounter(window)  # Passengers and emergencies, the wait_time denominator
+        self.passengers_carried_total = 0
+        self.emergencies_handled_total = 0
+        self.passenger_queue_length = 0
+        self.emergency_queue_length = 0
+        self.current_time = 0
+
+    def record_passenger(self, time, trip_time):
+        # A regular passenger reached their destination, trip_time after their request
+        with self.lock:
+            self.passengers_carried.add(time)
+            self.trip_time.add(time, trip_time)
+            self.deliveries.add(time)
+            self.passengers_carried_total += 1
+
+    def record_emergency(self, time, trip_time):
+        # An emergency reached its destination, trip_time after its request
+        with self.lock:
+            self.emergencies_handled.add(time)
+            self.trip_time.add(time, trip_time)
+            self.deliveries.add(time)
+            self.emergencies_handled_total += 1
+
+    def record_boarding(self, time, wait_time):
+        # A passenger or emergency got on the train, wait_time after their request
+        with self.lock:
+            self.wait_time.add(time, wait_time)
+            self.boardings.add(time)
+
+    def observe_queues(self, time, passengers, emergencies):
+        # Current depth of the passenger and emergency queues
+        with self.lock:
+            self.current_time = time
+            self.passenger_queue_length = passengers
+            self.emergency_queue_length = emergencies
+            for counter in (self.passengers_carried, self.emergencies_handled, self.trip_time, self.deliveries,
+                            self.wait_time, self.boardings):
+                counter.advance(time)
+
+    def exposition(self):
+        # Text exposition format, one HELP/TYPE header per metric
+        with self.lock:
+            deliveries = self.deliveries.total
+            boardings = self.boardings.total
+            samples = [
+                ('lab7_passengers_carried_total', 'counter', "Passengers delivered since the start.",
+                 self.passengers_carried_total),
+                ('lab7_emergencies_handled_total', 'counter', "Emergencies delivered since the start.",
+                 self.emergencies_handled_total),
+                ('lab7_passengers_carried_window', 'gauge',
+                 f"Passengers delivered in the last {self.window} time units.", self.passengers_carried.total),
+                ('lab7_emergencies_handled_window', 'gauge',
+                 f"Emergencies delivered in the last {self.window} time units.", self.emergencies_handled.total),
+                ('lab7_trip_time_mean', 'gauge',
+                 f"Mean time from request to arrival over the last {self.window} time units.",
+                 self.trip_time.total / deliveries if deliveries else 0),
+                ('lab7_wait_time_mean', 'gauge',
+                 f"Mean time from request to boarding over the last {self.window} time units.",
+                 self.wait_time.total / boardings if boardings else 0),
+                ('lab7_passenger_queue_length', 'gauge', "Passengers in the priority queue.",
+                 self.passenger_queue_length),
+                ('lab7_emergency_queue_length', 'gauge', "Due emergency requests not delivered yet.",
+                 self.emergency_queue_length),
+                ('lab7_simulation_time', 'gauge', "Current simulated time.", self.current_time),
+            ]
+        lines = []
+        for name, metric_type, help_text, value in samples:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name} {value}")
+        return '\n'.join(lines) + '\n'
+
+def serve_metrics(metrics, port=0, host='127.0.0.1'):
+    # Serve GET /metrics from a daemon thread; returns the server, call shutdown() to stop it
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.exposition().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep scrapes out of the simulation output
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,19 @@
+class Passenger:
+    def __init__(self, start_station, destination_station, request_time, priority=None):
+        self.start_station = start_station
+        self.destination_station = destination_station
+        self.request_time = request_time
+        self.priority = priority  # Lower value means higher priority, calculated dynamically when None
+        self.arrival_time = None  # Time when the passenger reaches their destination
+        self.boarding_time = None  # Time when the passenger boards the train
+
+    def __lt__(self, other):
+        return self.priority < other.priority
+
+class Emergency:
+    def __init__(self, start_station, destination_station, request_time):
+        self.start_station = start_station
+        self.destination_station = destination_station
+        self.request_time = request_time
+        self.arrival_time = None  # Time when the emergency reaches their destination
+        self.boarding_time = None  # Time when the emergency boards the train
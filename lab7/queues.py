@@ -0,0 +1,137 @@
+import bisect  # Import bisect for the sorted inserts into the aging buckets
+import heapq  # Import heapq for priority queue implementation
+from collections import deque  # Import deque for the per-destination aging buckets
+
+# Priority Queue class for storing passengers based on priority
+class PriorityQueue:
+    def __init__(self):
+        self.queue = []  # Initialize an empty list to store the heap
+
+    def peek(self):
+        # Return the passenger with the highest priority without removing it
+        if self.empty():
+            return None
+        return self.queue[0]  # The root of the heap has the highest priority
+
+    def push(self, passenger):
+        # Add a passenger to the priority queue
+        heapq.heappush(self.queue, passenger)  # Use heapq to maintain heap property
+
+    def pop(self):
+        # Remove and return the passenger with the highest priority
+        return heapq.heappop(self.queue)
+
+    def heapify(self):
+        # Rebuild the heap (useful after updating priorities)
+        heapq.heapify(self.queue)
+
+    def empty(self):
+        # Check if the priority queue is empty
+        return len(self.queue) == 0
+
+    def __len__(self):
+        return len(self.queue)
+
+    def remove(self, passenger):
+        # Remove a specific passenger from the queue
+        self.queue.remove(passenger)  # Remove passenger
+        heapq.heapify(self.queue)     # Rebuild the heap to maintain heap property
+
+    def peek_destination(self, station):
+        # Return any passenger travelling to the given station, or None
+        for passenger in self.queue:
+            if passenger.destination_station == station:
+                return passenger
+        return None
+
+# Aging priority queue: waiting time raises a passenger's priority so far destinations are not starved
+# Passengers are bucketed by destination station and each bucket is kept in request_time order, so
+# the oldest passenger of a bucket always has its best priority and aging never re-keys anyone
+class AgingPriorityQueue:
+    def __init__(self, stations, aging_rate=1):
+        self.stations = stations                                    # List of stations in the train system
+        self.station_index = {station: index for index, station in enumerate(stations)}
+        self.aging_rate = aging_rate                                # Priority gained per unit of waiting time
+        self.buckets = {station: deque() for station in stations}   # Destination station -> passengers, oldest first
+        self.size = 0                                               # Number of queued passengers
+        self.destination_mask = 0                                   # Bit i set while station i has passengers
+        self.train_location = stations[0]                           # Train station the priorities are measured from
+        self.current_time = 0                                       # Time the waiting is measured up to
+        self.head = None                                            # Cached highest priority passenger
+
+    @property
+    def queue(self):
+        # All queued passengers, for code that inspects the queue like PriorityQueue.queue
+        return [passenger for bucket in self.buckets.values() for passenger in bucket]
+
+    def advance(self, train_location, current_time):
+        # Move the reference point of the priorities; O(1), only the cached head is dropped
+        self.train_location = train_location
+        self.current_time = current_time
+        self.head = None
+
+    def effective_priority(self, passenger):
+        # Distance to the destination minus the credit earned by waiting (lower value means higher priority)
+        distance = abs(self.station_index[self.train_location] - self.station_index[passenger.destination_station])
+        return distance - self.aging_rate * (self.current_time - passenger.request_time)
+
+    def peek(self):
+        # Return the passenger with the highest priority without removing it; O(number of stations)
+        if self.head is None:
+            best_key = None
+            for bucket in self.buckets.values():
+                if bucket:
+                    oldest = bucket[0]  # The oldest passenger has the best priority of its bucket
+                    key = (self.effective_priority(oldest), oldest.request_time)
+                    if best_key is None or key < best_key:
+                        best_key = key
+                        self.head = oldest
+            if self.head is not None:
+                self.head.priority = best_key[0]  # Expose the aged priority like the other queues do
+        return self.head
+
+    def push(self, passenger):
+        # Add a passenger, keeping its bucket in request_time order. New requests go to the back in O(1);
+        # older ones, like passengers transferring from another line, are inserted in their place
+        bucket = self.buckets[passenger.destination_station]
+        if not bucket or bucket[-1].request_time <= passenger.request_time:
+            bucket.append(passenger)
+        else:
+            bisect.insort(bucket, passenger, key=lambda queued: queued.request_time)
+        self.size += 1
+        self.destination_mask |= 1 << self.station_index[passenger.destination_station]
+        self.head = None
+
+    def pop(self):
+        # Remove and return the passenger with the highest priority
+        passenger = self.peek()
+        self.remove(passenger)
+        return passenger
+
+    def heapify(self):
+        # Nothing to rebuild: priorities are derived from the buckets when peeking
+        self.head = None
+
+    def empty(self):
+        # Check if the aging queue is empty
+        return self.size == 0
+
+    def __len__(self):
+        return self.size
+
+    def remove(self, passenger):
+        # Remove a specific passenger from the queue; O(1) for the oldest passenger of a bucket
+        bucket = self.buckets[passenger.destination_station]
+        if bucket[0] is passenger:
+            bucket.popleft()
+        else:
+            bucket.remove(passenger)
+        self.size -= 1
+        self.head = None
+        if not bucket:
+            self.destination_mask &= ~(1 << self.station_index[passenger.destination_station])
+
+    def peek_destination(self, station):
+        # Return the oldest passenger travelling to the given station, or None; O(1)
+        bucket = self.buckets[station]
+        return bucket[0] if bucket else None
@@ -0,0 +1,190 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+class RoutePlanner:
+    # Caches the times the train is planned to be at each station along a route of waypoints.
+    # Station visit times are kept sorted per station, so an ETA lookup is a binary search.
+    def __init__(self, stations):
+        self.stations = stations
+        self.station_index = {station: index for index, station in enumerate(stations)}
+        self.origin = stations[0]
+        self.origin_time = 0
+        self.waypoints = []
+        self.waypoint_times = []  # Arrival time at each waypoint
+        self.route = []  # Waypoints as last passed to plan(), repeats included
+        self.route_times = []  # Time each of those waypoints is reached
+        self.visits = {station: [] for station in stations}  # Planned times the train is at each station
+        self.visits[self.origin].append(self.origin_time)
+
+    def station_distance(self, start, end):
+        return abs(self.station_index[start] - self.station_index[end])
+
+    def reset(self, station, time):
+        self.origin = station
+        self.origin_time = time
+        self.waypoints = []
+        self.waypoint_times = []
+        for times in self.visits.values():
+            times.clear()
+        self.visits[station].append(time)
+
+    def position_at(self, time):
+        # Station the plan puts the train at, assuming no waypoint is reached after origin_time before time
+        if not self.waypoints:
+            return self.origin
+        step = 1 if self.station_index[self.waypoints[0]] > self.station_index[self.origin] else -1
+        return self.stations[self.station_index[self.origin] + step * (time - self.origin_time)]
+
+    def discard_reached(self, time):
+        # Drop waypoints already reached at time, making the last one the new origin
+        reached = bisect_right(self.waypoint_times, time)
+        if reached == 0:
+            return
+        self.origin = self.waypoints[reached - 1]
+        self.origin_time = self.waypoint_times[reached - 1]
+        del self.waypoints[:reached]
+        del self.waypoint_times[:reached]
+        for times in self.visits.values():
+            del times[:bisect_left(times, self.origin_time)]
+
+    def extend(self, waypoints):
+        # Append legs to the plan, recording every station passed along the way
+        station = self.waypoints[-1] if self.waypoints else self.origin
+        time = self.waypoint_times[-1] if self.waypoint_times else self.origin_time
+        for waypoint in waypoints:
+            if waypoint == station:
+                continue  # Zero-length leg, the train is already there
+            index = self.station_index[station]
+            step = 1 if self.station_index[waypoint] > index else -1
+            for _ in range(self.station_distance(station, waypoint)):
+                index += step
+                time += 1
+                self.visits[self.stations[index]].append(time)
+            station = waypoint
+            self.waypoints.append(waypoint)
+            self.waypoint_times.append(time)
+
+    def plan(self, station, time, waypoints):
+        # Follow a new route from station at time, keeping cached visits for the unchanged part of the route
+        self.discard_reached(time)
+        if self.position_at(time) != station:
+            self.reset(station, time)  # Train left the cached plan, nothing can be reused
+        route = []
+        previous = station
+        for waypoint in waypoints:
+            if waypoint != previous:
+                route.append(waypoint)
+                previous = waypoint
+        common = 0
+        while common < min(len(route), len(self.waypoints)) and route[common] == self.waypoints[common]:
+            common += 1
+        if common == 0:
+            self.reset(station, time)
+        elif common < len(self.waypoints):
+            # Invalidate only the visits planned after the last shared waypoint
+            cutoff = self.waypoint_times[common - 1]
+            del self.waypoints[common:]
+            del self.waypoint_times[common:]
+            for times in self.visits.values():
+                while times and times[-1] > cutoff:
+                    times.pop()
+        self.extend(route[common:])
+        # Times for the waypoints as given; a repeated waypoint is reached together with the previous one
+        self.route = list(waypoints)
+        self.route_times = []
+        reached = -1
+        previous = station
+        for waypoint in waypoints:
+            if waypoint != previous:
+                reached += 1
+                previous = waypoint
+            self.route_times.append(self.waypoint_times[reached] if reached >= 0 else time)
+
+    def estimate_arrival(self, start, destination, now, ahead, committed):
+        # Arrival time at destination for a passenger boarding at start, O(log n) in the planned visits.
+        # The train only drops a passenger off once they are its target: after boarding, it first
+        # finishes the waypoint it is driving to and the first `ahead` waypoints of the route. Only the
+        # first `committed` waypoints are fixed; later ones are chosen when the train gets to them
+        end_station = self.waypoints[-1] if self.waypoints else self.origin
+        end_time = self.waypoint_times[-1] if self.waypoint_times else self.origin_time
+        times = self.visits[start]
+        position = bisect_left(times, now)
+        if position == len(times):
+            # Start is not on the remaining route: go there once the route is finished
+            boarding_time = max(end_time, now) + self.station_distance(end_station, start)
+            return boarding_time + self.station_distance(start, destination)
+        boarding_time = times[position]
+        if destination == start:
+            return boarding_time
+        # Waypoints reached by boarding_time are done and the next one is being driven to, unless the
+        # train only just reached a waypoint and will choose the next one after this passenger boards
+        reached = bisect_right(self.route_times, boarding_time)
+        driving_to = reached
+        if reached >= committed and (self.route_times[reached - 1] if reached else now) == boarding_time:
+            driving_to = reached - 1
+        last = max(ahead - 1, driving_to)
+        if last < 0 or last >= len(self.route):
+            return boarding_time + self.station_distance(start, destination)
+        return self.route_times[last] + self.station_distance(self.route[last], destination)
+
+class RouteCache:
+    # Bounded LRU cache of route decisions with hit/miss statistics
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute):
+        # Return the cached decision for key, computing and storing it on a miss
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        value = compute()
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)  # Evict the least recently used decision
+        return value
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.entries),
+            'hit_rate': self.hits / lookups if lookups else None,
+        }
+
+def plan_direction(position, destination_mask):
+    # First move (+1, -1, or 0 when nothing is pending) of the order of visiting every destination in
+    # the bitmask that minimizes their summed arrival time. On a line the visited stations always form
+    # an interval around the start, so the search only chooses between the nearest pending station on
+    # each side: O(k^2) states for k pending destinations.
+    left = [index for index in range(position - 1, -1, -1) if destination_mask >> index & 1]
+    right = [index for index in range(position + 1, destination_mask.bit_length()) if destination_mask >> index & 1]
+    if not left or not right:
+        return 1 if right else -1 if left else 0
+    costs = {}
+
+    def cost(visited_left, visited_right, at_right):
+        # Summed arrival time of the remaining destinations, standing at the last station visited
+        if visited_left == len(left) and visited_right == len(right):
+            return 0
+        key = (visited_left, visited_right, at_right)
+        if key not in costs:
+            station = right[visited_right - 1] if at_right else left[visited_left - 1]
+            remaining = len(left) - visited_left + len(right) - visited_right
+            options = []
+            if visited_left < len(left):
+                options.append(remaining * (station - left[visited_left]) + cost(visited_left + 1, visited_right, False))
+            if visited_right < len(right):
+                options.append(remaining * (right[visited_right] - station) + cost(visited_left, visited_right + 1, True))
+            costs[key] = min(options)
+        return costs[key]
+
+    remaining = len(left) + len(right)
+    left_cost = remaining * (position - left[0]) + cost(1, 0, False)
+    right_cost = remaining * (right[0] - position) + cost(0, 1, True)
+    return -1 if left_cost < right_cost else 1
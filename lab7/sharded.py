@@ -0,0 +1,193 @@
+# Sharded multi-line simulation: every line runs its own CycleTrainSystem, in its own worker process,
+# and passengers change lines at interchange stations. Lines advance in rounds of sync_interval cycles;
+# at the end of each round every line sends the passengers it dropped off at interchanges to the other
+# lines and waits for theirs, so all lines see the same transfers at the same simulated time.
+import random
+import time
+
+from .cycle import CycleTrainSystem
+from .passenger import Passenger
+
+class ShardTrainSystem(CycleTrainSystem):
+    # Cycle engine for one line that also carries passengers bound for other lines
+    def __init__(self, stations, transfers, transfer_rate=0.2, **options):
+        super().__init__(stations, **options)
+        self.transfers = transfers  # Interchange station -> [(other line, station there, stations of that line)]
+        self.transfer_rate = transfer_rate  # Chance each cycle of an extra passenger bound for another line
+        self.waiting_transfers = {station: [] for station in stations}  # Arrivals from other lines
+        self.outbox = []  # (request_time, line, station, destination) to hand over at the next barrier
+        self.transfers_out = 0
+        self.transfers_in = 0
+
+    def generate_new_passengers(self):
+        super().generate_new_passengers()
+        if not self.transfers or self.rng.random() >= self.transfer_rate:
+            return
+        interchange = self.rng.choice(sorted(self.transfers))
+        line, station, line_stations = self.rng.choice(self.transfers[interchange])
+        destination = self.rng.choice([other for other in line_stations if other != station])
+        passenger = Passenger(self.train_location, interchange, self.current_time,
+                              self.passenger_priority(interchange))
+        passenger.transfer = (line, station, destination)
+        if interchange == self.train_location:
+            self.hand_over(passenger)  # Already at the interchange, no ride needed on this line
+            return
+        self.passengers.push(passenger)
+        if self.verbose:
+            print(f"New passenger from {self.train_location} to {destination} on line {line} "
+                  f"via {interchange} at time {self.current_time}")
+
+    def hand_over(self, passenger):
+        line, station, destination = passenger.transfer
+        self.outbox.append((passenger.request_time, line, station, destination))
+        self.transfers_out += 1
+        if self.verbose:
+            print(f"Passenger transferring at {self.train_location} to line {line}")
+
+    def drop_off_passenger(self, passenger):
+        if getattr(passenger, 'transfer', None) is None:
+            super().drop_off_passenger(passenger)
+            return
+        # Transfer passengers finish their trip on the other line, their travel time is counted there
+        self.passengers.remove(passenger)
+        self.hand_over(passenger)
+
+    def receive_transfers(self, records):
+        # Passengers arriving from other lines wait at the interchange for this line's train
+        for request_time, station, destination in records:
+            self.waiting_transfers[station].append((request_time, destination))
+            self.transfers_in += 1
+
+    def cycle_at_station(self):
+        waiting = self.waiting_transfers[self.train_location]
+        for request_time, destination in waiting:
+            # request_time is kept so the recorded travel time covers the whole journey
+            self.passengers.push(Passenger(self.train_location, destination, request_time,
+                                           self.passenger_priority(destination)))
+        waiting.clear()
+        super().cycle_at_station()
+
+    def take_outbox(self):
+        outbox, self.outbox = self.outbox, []
+        return outbox
+
+    def summary(self):
+        from .stats import summarize
+
+        return {
+            'final_time': self.current_time,
+            'passengers_carried': len(self.travel_times),
+            'emergencies_handled': self.emergencies_handled,
+            'transfers_out': self.transfers_out,
+            'transfers_in': self.transfers_in,
+            'unserved': len(self.passengers) + self.emergencies.stack.size +
+                        sum(len(waiting) for waiting in self.waiting_transfers.values()),
+            'travel_time': summarize(self.travel_times),
+        }
+
+def line_transfers(lines, interchanges):
+    # {line: {station: [(other line, other station, other line's stations)]}} from interchange pairs
+    transfers = {name: {} for name in lines}
+    for line, station, other_line, other_station in interchanges:
+        if line not in lines or other_line not in lines or line == other_line:
+            raise ValueError(f"interchange {line}:{station} - {other_line}:{other_station} must join two known lines")
+        if station not in lines[line] or other_station not in lines[other_line]:
+            raise ValueError(f"interchange {line}:{station} - {other_line}:{other_station} names an unknown station")
+        transfers[line].setdefault(station, []).append((other_line, other_station, lines[other_line]))
+        transfers[other_line].setdefault(other_station, []).append((line, station, lines[line]))
+    return transfers
+
+def _build_shard(name, lines, transfers, seed, options):
+    return ShardTrainSystem(lines[name], transfers[name], rng=random.Random(f'{seed}-{name}'), verbose=False,
+                            **options)
+
+def _rounds(cycles, sync_interval):
+    for start in range(0, cycles, sync_interval):
+        yield min(sync_interval, cycles - start)
+
+def _deliver(outbox, names):
+    # Split an outbox into one record list per receiving line
+    deliveries = {name: [] for name in names}
+    for request_time, line, station, destination in outbox:
+        deliveries[line].append((request_time, station, destination))
+    return deliveries
+
+def _line_worker(name, lines, transfers, cycles, sync_interval, seed, options, inboxes, results):
+    # Runs one line in a worker process. After each round it sends one message to every other line and
+    # blocks until it has one from each of them: that exchange is the round's time barrier.
+    shard = _build_shard(name, lines, transfers, seed, options)
+    peers = sorted(other for other in lines if other != name)
+    early = {}  # Messages from peers that are already a round ahead
+    for round_number, round_cycles in enumerate(_rounds(cycles, sync_interval)):
+        for _ in range(round_cycles):
+            shard.cycle_at_station()
+        deliveries = _deliver(shard.take_outbox(), lines)
+        for peer in peers:
+            inboxes[peer].put((round_number, name, deliveries[peer]))
+        received = early.pop(round_number, {})
+        while len(received) < len(peers):
+            message_round, sender, records = inboxes[name].get()
+            if message_round == round_number:
+                received[sender] = records
+            else:
+                early.setdefault(message_round, {})[sender] = records
+        for sender in peers:  # Fixed order keeps runs reproducible
+            shard.receive_transfers(received[sender])
+    results.put((name, shard.summary()))
+
+def simulate_lines(lines, interchanges, cycles, sync_interval=10, seed=0, processes=True, **options):
+    # lines: {name: [stations]}, interchanges: [(line, station, other line, other station)].
+    # options go to every line's CycleTrainSystem (policy, aging_rate, emergency_rate) and
+    # ShardTrainSystem (transfer_rate). processes=False runs the same rounds in this process.
+    if sync_interval < 1:
+        raise ValueError("sync_interval must be at least 1")
+    transfers = line_transfers(lines, interchanges)
+    names = sorted(lines)
+    start = time.perf_counter()
+    if processes and len(names) > 1:
+        import multiprocessing
+        import queue
+
+        inboxes = {name: multiprocessing.Queue() for name in names}
+        results = multiprocessing.Queue()
+        workers = [multiprocessing.Process(target=_line_worker, args=(name, lines, transfers, cycles, sync_interval,
+                                                                      seed, options, inboxes, results))
+                   for name in names]
+        for worker in workers:
+            worker.start()
+        summaries = {}
+        while len(summaries) < len(workers):
+            try:
+                name, summary = results.get(timeout=1)
+            except queue.Empty:
+                failed = [worker.exitcode for worker in workers if worker.exitcode not in (None, 0)]
+                if failed:
+                    # The other lines would wait forever at the next barrier
+                    for worker in workers:
+                        worker.terminate()
+                    raise RuntimeError(f"line worker exited with status {failed[0]}") from None
+                continue
+            summaries[name] = summary
+        for worker in workers:
+            worker.join()
+    else:
+        shards = {name: _build_shard(name, lines, transfers, seed, options) for name in names}
+        for round_cycles in _rounds(cycles, sync_interval):
+            for shard in shards.values():
+                for _ in range(round_cycles):
+                    shard.cycle_at_station()
+            deliveries = {name: _deliver(shards[name].take_outbox(), lines) for name in names}
+            for name in names:
+                for sender in names:
+                    if sender != name:
+                        shards[name].receive_transfers(deliveries[sender][name])
+        summaries = {name: shard.summary() for name, shard in shards.items()}
+    return {
+        'cycles': cycles,
+        'sync_interval': sync_interval,
+        'seed': seed,
+        'seconds': time.perf_counter() - start,
+        'passengers_carried': sum(summary['passengers_carried'] for summary in summaries.values()),
+        'transfers': sum(summary['transfers_out'] for summary in summaries.values()),
+        'lines': {name: summaries[name] for name in names},
+    }
@@ -0,0 +1,68 @@
+# Node class for the linked list implementation
+class Node:
+    def __init__(self, data, next=None):
+        self.data = data  # Store data (Passenger object)
+        self.next = next  # Pointer to the next node
+
+# LinkedList class to implement stack functionality for emergencies
+class LinkedList:
+    def __init__(self):
+        self.head = None  # Initialize the head of the list
+        self.size = 0     # Keep track of the size of the list
+
+    def add(self, data):
+        # Add a new node with the given data to the end of the list
+        new_node = Node(data)
+        if self.head is None:
+            self.head = new_node  # If list is empty, new node is the head
+        else:
+            current = self.head
+            while current.next is not None:
+                current = current.next  # Traverse to the end of the list
+            current.next = new_node  # Append the new node
+        self.size += 1  # Increment the size of the list
+
+    def remove(self, node):
+        # Remove the given node from the list
+        if node is None:
+            return
+        if node == self.head:
+            self.head = node.next  # If node is head, update head
+        else:
+            current = self.head
+            while current.next != node:
+                current = current.next  # Find the node before the one to remove
+            current.next = node.next  # Bypass the node to remove
+        self.size -= 1  # Decrement the size of the list
+
+    def remove_head(self):
+        # Remove and return the data from the head node
+        if self.head is None:
+            return None
+        node = self.head
+        self.head = self.head.next  # Update head to the next node
+        self.size -= 1  # Decrement the size of the list
+        return node.data  # Return the data from the removed node
+
+# Stack class for storing emergency passengers
+class Stack:
+    def __init__(self):
+        self.stack = LinkedList()  # Use LinkedList to implement the stack
+
+    def peek(self):
+        # Return the passenger on top of the stack without removing it
+        if self.is_empty():
+            return None
+        return self.stack.head.data  # The head of the linked list is the top of the stack
+
+    def push(self, item):
+        # Push a new passenger onto the stack
+        self.stack.add(item)
+
+    def pop(self):
+        # Pop the top passenger from the stack and return it
+        return self.stack.remove_head()
+
+    def is_empty(self):
+        # Check if the stack is empty
+        return self.stack.size == 0
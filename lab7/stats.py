@@ -0,0 +1,21 @@
+import math
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of a list of values
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, math.ceil(len(ordered) * fraction) - 1)
+    return ordered[rank]
+
+def summarize(travel_times):
+    # Count, mean and tail of a list of travel times
+    if not travel_times:
+        return {'count': 0, 'mean': None, 'p50': None, 'p99': None, 'max': None}
+    return {
+        'count': len(travel_times),
+        'mean': sum(travel_times) / len(travel_times),
+        'p50': percentile(travel_times, 0.5),
+        'p99': percentile(travel_times, 0.99),
+        'max': max(travel_times),
+    }
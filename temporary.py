@@ -21,8 +21,9 @@ class Passenger:
         return f"Passenger({self.start_station}->{self.destination_station}, priority={self.assigned_priority}, emergency={self.emergency})"
 
 class TrainSystem:
-    def __init__(self, stations):
+    def __init__(self, stations, service_mode='single'):
         self.stations = stations
+        self.service_mode = service_mode  # 'single' serves one passenger per trip, 'batch' everyone along the way
         self.passengers = []  # priority queue for regular passengers
         self.emergencies = []  # stack for emergency passengers
         self.onboard_passengers = []
@@ -30,6 +31,10 @@ class TrainSystem:
         self.train_location = stations[0]
         self.total_travel_time = 0
         self.total_passengers = 0
+        # Batch mode indexes waiting passengers by start then destination station, and riders by destination,
+        # so boarding and alighting at a station only touch the passengers involved
+        self.waiting = {start: {destination: [] for destination in stations} for start in stations}
+        self.riders = {destination: [] for destination in stations}
 
     def calculate_distance(self, start, end):
         return abs(self.stations.index(start) - self.stations.index(end))
@@ -53,11 +58,16 @@ class TrainSystem:
                 destination_station = random.choice(self.stations)
             new_passenger = Passenger(start_station, destination_station, self.current_time)
             self.passengers.append(new_passenger)
+            if self.service_mode == 'batch':
+                self.waiting[start_station][destination_station].append(new_passenger)
             print(f"New passenger added: {new_passenger}")
         # We need to heapify the priority queue
         heapq.heapify(self.passengers)
 
     def update_priorities(self):
+        if self.service_mode == 'batch':
+            # Passengers picked up on an earlier trip are still in the heap, drop them before re-keying
+            self.passengers = [passenger for passenger in self.passengers if not passenger.boarded]
         # Update priority of each passenger based on distance from train's location to their destination
         for passenger in self.passengers:
             distance = self.calculate_distance(self.train_location, passenger.destination_station)
@@ -111,6 +121,14 @@ class TrainSystem:
         while self.emergencies:
             emergency_passenger = self.emergencies.pop()
             print(f"Handling emergency: {emergency_passenger}")
+            if self.service_mode == 'batch':
+                # Other passengers ride along with the emergency when it does not cost a detour
+                self.serve_trip(emergency_passenger)
+                self.generate_new_passengers()
+                if self.emergencies:
+                    continue
+                else:
+                    break
             # Move train to emergency passenger's start station if not already there
             if self.train_location != emergency_passenger.start_station:
                 self.move_train_to_station(emergency_passenger.start_station)
@@ -153,15 +171,76 @@ class TrainSystem:
             self.board_passengers()
             self.generate_new_passengers()
 
+    def trip_stops(self, passenger):
+        # Stations visited from the train's location to the passenger's start and then their destination
+        stops = [self.train_location]
+        for target in (passenger.start_station, passenger.destination_station):
+            index = self.stations.index(stops[-1])
+            target_index = self.stations.index(target)
+            step = 1 if target_index > index else -1
+            while index != target_index:
+                index += step
+                stops.append(self.stations[index])
+        return stops
+
+    def board_waiting(self, station, last_stop, position):
+        # Board every passenger waiting at station whose destination is still ahead on the trip
+        boarding_passengers = []
+        for destination_station, waiting in self.waiting[station].items():
+            if waiting and last_stop.get(destination_station, -1) > position:
+                for passenger in waiting:
+                    passenger.boarded = True
+                    passenger.pickup_time = self.current_time
+                self.riders[destination_station].extend(waiting)
+                boarding_passengers.extend(waiting)
+                waiting.clear()
+        if boarding_passengers:
+            print(f"Passengers boarded at {station}: {boarding_passengers}")
+
+    def alight_riders(self, station):
+        # Drop off every rider whose destination is this station
+        alighting_passengers = self.riders[station]
+        if not alighting_passengers:
+            return
+        for passenger in alighting_passengers:
+            passenger.dropoff_time = self.current_time
+            self.total_travel_time += passenger.dropoff_time - passenger.pickup_time
+            self.total_passengers += 1
+        self.riders[station] = []
+        print(f"Passengers alighted at {station}: {alighting_passengers}")
+
+    def serve_trip(self, passenger):
+        # Drive the passenger from their start to their destination, picking up and dropping off
+        # every compatible passenger along the route
+        stops = self.trip_stops(passenger)
+        last_stop = {station: position for position, station in enumerate(stops)}
+        for position, station in enumerate(stops):
+            if position > 0:
+                self.move_train(station)
+                self.generate_new_passengers()
+            self.alight_riders(station)
+            if station == passenger.start_station and passenger.emergency:
+                # Emergencies are not in the waiting index, board them directly; regular passengers,
+                # including this trip's, are boarded from the index by board_waiting below
+                passenger.boarded = True
+                passenger.pickup_time = self.current_time
+                self.riders[passenger.destination_station].append(passenger)
+                print(f"Passenger boarded at {station}: {passenger}")
+            self.board_waiting(station, last_stop, position)
+
     def simulate_cycle(self):
         print(f"\nCycle {self.current_time}: Train at {self.train_location}")
         self.generate_new_passengers()
-        self.board_passengers()
-        self.alight_passengers()
+        if self.service_mode == 'single':
+            self.board_passengers()
+            self.alight_passengers()
         # Update priorities after boarding and alighting
         self.update_priorities()
         if self.emergencies:
             self.handle_emergencies()
+        elif self.passengers and self.service_mode == 'batch':
+            # Serve the highest priority passenger and everyone compatible with their trip
+            self.serve_trip(heapq.heappop(self.passengers))
         elif self.passengers:
             # Get the highest priority passenger
             highest_priority_passenger = heapq.heappop(self.passengers)
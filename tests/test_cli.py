@@ -0,0 +1,29 @@
+import json
+
+import pytest
+
+from lab7 import cli, sharded
+
+def write_lines(tmp_path):
+    path = tmp_path / 'lines.json'
+    path.write_text(json.dumps({'lines': {'red': ['A', 'B', 'C'], 'blue': ['D', 'E']},
+                                'interchanges': [['red', 'C', 'blue', 'D']]}))
+    return str(path)
+
+def test_shard_reports_a_failed_worker(tmp_path, monkeypatch, capsys):
+    def failing_simulate_lines(*args, **kwargs):
+        raise RuntimeError("line worker exited with status 1")
+
+    monkeypatch.setattr(sharded, 'simulate_lines', failing_simulate_lines)
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['shard', write_lines(tmp_path), '--cycles', '20'])
+    assert exit_info.value.code == 2
+    assert "line worker exited" in capsys.readouterr().err
+
+def test_shard_in_process_summary(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['shard', write_lines(tmp_path), '--cycles', '50', '--seed', '1', '--in-process', '--json',
+                  '--policy', 'nearest', '--emergency-rate', '0.5'])
+    assert exit_info.value.code == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert set(summary['lines']) == {'red', 'blue'}
@@ -0,0 +1,22 @@
+import random
+
+import pytest
+
+from lab7.cycle import CycleTrainSystem
+
+STATIONS = ['A', 'B', 'C', 'D', 'E', 'F']
+
+@pytest.mark.parametrize('policy', ['nearest', 'farthest', 'aging', 'lookahead'])
+@pytest.mark.parametrize('emergency_rate', [1, 0.5, 0])
+def test_passengers_alight_at_their_destination(policy, emergency_rate):
+    for seed in range(5):
+        train_system = CycleTrainSystem(STATIONS, policy=policy, rng=random.Random(seed), verbose=False,
+                                        emergency_rate=emergency_rate)
+        for _ in range(300):
+            train_system.cycle_at_station()
+            if policy != 'nearest':  # Nearest only drops off the head of its queue, like mainV4.py
+                # Everyone bound for the station the train just left got off there
+                previous = train_system.stations[train_system.stations.index(train_system.train_location) -
+                                                 int(train_system.train_direction)]
+                assert train_system.passengers.peek_destination(previous) is None
+        assert train_system.travel_times
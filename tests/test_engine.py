@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from lab7.engine import TrainSystem
+from lab7.passenger import Emergency, Passenger
+
+STATIONS = ['A', 'B', 'C', 'D', 'E']
+
+def run_workload(policy, seed):
+    rng = random.Random(seed)
+    train_system = TrainSystem(STATIONS, verbose=False, policy=policy)
+    for _ in range(40):
+        start, destination = rng.sample(STATIONS, 2)
+        request_class = Emergency if rng.random() < 0.1 else Passenger
+        request = request_class(start, destination, rng.randint(1, 30))
+        if request_class is Emergency:
+            train_system.add_emergency_request(request)
+        else:
+            train_system.add_passenger_request(request)
+    train_system.run(max_time=1000)
+    return train_system
+
+@pytest.mark.parametrize('policy', ['nearest', 'aging'])
+def test_every_request_is_delivered(policy):
+    for seed in range(10):
+        train_system = run_workload(policy, seed)
+        assert not train_system.pending()
+        assert train_system.total_passengers == len(train_system.travel_times) == 40
+
+def test_aging_orders_by_waiting_time():
+    train_system = TrainSystem(STATIONS, verbose=False, policy='aging', aging_rate=1)
+    train_system.current_time = 10
+    near = Passenger('A', 'B', 9)
+    far = Passenger('A', 'E', 1)  # Distance 4 but waiting 9, ahead of the distance 1 passenger waiting 1
+    for passenger in (near, far):
+        passenger.boarding_time = 10
+        train_system.queue_passenger(passenger)
+    assert train_system.queued_in_order() == [far, near]
+    assert train_system.next_passenger() is far
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        TrainSystem(STATIONS, policy='farthest')
+
+class QueueRecorder:
+    # Stand-in for LiveMetrics that keeps every emergency queue observation
+    def __init__(self):
+        self.emergencies = []
+
+    def observe_queues(self, time, passengers, emergencies):
+        self.emergencies.append((time, emergencies))
+
+    def record_passenger(self, time, trip_time):
+        pass
+
+    def record_emergency(self, time, trip_time):
+        pass
+
+    def record_boarding(self, time, wait_time):
+        pass
+
+def test_emergency_gauge_counts_due_undelivered_emergencies():
+    recorder = QueueRecorder()
+    train_system = TrainSystem(['A', 'B', 'C', 'D'], verbose=False, metrics=recorder)
+    for request_time, start, destination in [(2, 'C', 'D'), (2, 'D', 'A'), (500, 'A', 'B')]:
+        train_system.add_emergency_request(Emergency(start, destination, request_time))
+    train_system.run(max_time=600)
+    observed = dict(recorder.emergencies)  # Last observation of each time
+    assert observed[1] == 0  # Nothing due yet
+    assert observed[3] == observed[4] == 2  # Both due emergencies, waiting or on board
+    assert observed[6] == 1
+    assert observed[100] == 0  # The t=500 emergency is not due
+    assert observed[500] == 1
@@ -0,0 +1,29 @@
+# The differential properties from lab7.equivalence, run by pytest
+import pytest
+
+from lab7 import equivalence
+
+equivalence.register_defaults()
+
+def test_seeded_workloads_match_reference():
+    equivalence.random_checks(50)
+
+def test_engine_matches_reference_under_hypothesis():
+    hypothesis = pytest.importorskip('hypothesis')
+
+    @hypothesis.settings(max_examples=100, deadline=None)
+    @hypothesis.given(equivalence.workloads())
+    def check(workload):
+        equivalence.check_engine(workload)
+
+    check()
+
+def test_cycle_matches_reference_under_hypothesis():
+    hypothesis = pytest.importorskip('hypothesis')
+
+    @hypothesis.settings(max_examples=100, deadline=None)
+    @hypothesis.given(equivalence.cycle_runs())
+    def check(run):
+        equivalence.check_cycle(*run)
+
+    check()
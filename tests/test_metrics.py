@@ -0,0 +1,49 @@
+import pytest
+
+from lab7.metrics import LiveMetrics, RollingCounter
+
+def test_rolling_counter_expires_old_slots():
+    counter = RollingCounter(3)
+    counter.add(0, 5)
+    counter.add(2, 1)
+    assert counter.total == 6
+    counter.advance(3)
+    assert counter.total == 1
+    counter.add(0, 10)  # Older than the window, dropped
+    assert counter.total == 1
+
+@pytest.mark.parametrize('window', [0, -5])
+def test_window_must_be_positive(window):
+    with pytest.raises(ValueError):
+        RollingCounter(window)
+    with pytest.raises(ValueError):
+        LiveMetrics(window)
+
+def test_exposition_reports_trip_time():
+    metrics = LiveMetrics(window=10)
+    metrics.record_passenger(4, 3)
+    metrics.record_emergency(5, 1)
+    text = metrics.exposition()
+    assert 'lab7_trip_time_mean 2.0' in text
+    assert 'lab7_passengers_carried_total 1' in text
+
+def test_exposition_reports_wait_time():
+    metrics = LiveMetrics(window=5)
+    metrics.record_boarding(1, 4)
+    metrics.record_boarding(3, 2)
+    assert 'lab7_wait_time_mean 3.0' in metrics.exposition()
+    metrics.observe_queues(7, 0, 0)  # The boarding at time 1 leaves the window
+    assert 'lab7_wait_time_mean 2.0' in metrics.exposition()
+
+def test_request_engine_records_waits():
+    from lab7.engine import TrainSystem
+    from lab7.passenger import Passenger
+
+    metrics = LiveMetrics(window=100)
+    train_system = TrainSystem(['A', 'B', 'C', 'D'], verbose=False, metrics=metrics)
+    train_system.add_passenger_request(Passenger('A', 'C', 1))  # Boards at once
+    train_system.add_passenger_request(Passenger('B', 'D', 1))  # Boards when the train passes B at 2
+    train_system.run(max_time=20)
+    assert metrics.boardings.total == 2
+    assert metrics.wait_time.total == 1
+    assert 'lab7_wait_time_mean 0.5' in metrics.exposition()
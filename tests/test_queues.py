@@ -0,0 +1,51 @@
+import random
+
+from lab7.passenger import Passenger
+from lab7.queues import AgingPriorityQueue, PriorityQueue
+
+STATIONS = ['A', 'B', 'C', 'D', 'E']
+
+def aged_key(queue, passenger):
+    if passenger is None:
+        return None
+    return (queue.effective_priority(passenger), passenger.request_time)
+
+def brute_force_key(queue, passengers):
+    # The best key a full re-key of every waiting passenger would find
+    return min((aged_key(queue, passenger) for passenger in passengers), default=None)
+
+def test_aging_peek_matches_full_rekey_with_out_of_order_pushes():
+    rng = random.Random(0)
+    for _ in range(200):
+        queue = AgingPriorityQueue(STATIONS, aging_rate=rng.choice([0, 1, 2]))
+        passengers = []
+        for time in range(40):
+            queue.advance(rng.choice(STATIONS), time)
+            action = rng.random()
+            if action < 0.5:
+                # Transfers and late boardings carry a request_time from the past
+                passenger = Passenger(rng.choice(STATIONS), rng.choice(STATIONS), time - rng.randint(0, 15))
+                queue.push(passenger)
+                passengers.append(passenger)
+            elif action < 0.8 and passengers:
+                expected = brute_force_key(queue, passengers)
+                passenger = queue.pop()
+                assert aged_key(queue, passenger) == expected
+                passengers.remove(passenger)
+            elif passengers:
+                passenger = rng.choice(passengers)
+                queue.remove(passenger)
+                passengers.remove(passenger)
+            assert aged_key(queue, queue.peek()) == brute_force_key(queue, passengers)
+            assert len(queue) == len(passengers)
+            for bucket in queue.buckets.values():
+                times = [passenger.request_time for passenger in bucket]
+                assert times == sorted(times)
+
+def test_peek_destination():
+    for queue in (PriorityQueue(), AgingPriorityQueue(STATIONS)):
+        passenger = Passenger('A', 'C', 0, 2)
+        queue.push(passenger)
+        queue.push(Passenger('A', 'B', 1, 1))
+        assert queue.peek_destination('C') is passenger
+        assert queue.peek_destination('D') is None
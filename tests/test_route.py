@@ -0,0 +1,65 @@
+import random
+
+from lab7.engine import TrainSystem
+from lab7.passenger import Passenger
+
+STATIONS = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
+
+def estimate_and_run(seed):
+    # Ask for an estimate partway through a run, then add that passenger and run to the end. Returns
+    # (estimate, actual arrival), or None when the outcome depends on things the estimate cannot see:
+    # passengers still waiting to board, or queued passengers with equal priorities
+    rng = random.Random(seed)
+    train_system = TrainSystem(STATIONS, verbose=False)
+    for destination in rng.sample(STATIONS[1:], rng.randint(1, len(STATIONS) - 1)):
+        # Everyone boards at the first station, where the train starts
+        train_system.add_passenger_request(Passenger(STATIONS[0], destination, 1))
+    ask_time = rng.randint(1, 16)
+    start, destination = rng.sample(STATIONS, 2)
+    process_boarding = train_system.process_boarding
+    asked = {}
+
+    def asking_boarding():
+        if not asked and train_system.current_time >= ask_time:
+            priorities = [p.priority for p in train_system.passenger_queue]
+            priorities.append(train_system.station_distance(start, destination))
+            if train_system.passenger_requests or len(set(priorities)) < len(priorities):
+                asked['skip'] = True
+            else:
+                asked['estimate'] = train_system.estimate_arrival(start, destination)
+                asked['passenger'] = Passenger(start, destination, train_system.current_time)
+                train_system.add_passenger_request(asked['passenger'])
+        process_boarding()
+
+    train_system.process_boarding = asking_boarding
+    train_system.run(max_time=200)
+    if 'estimate' not in asked or asked['passenger'].arrival_time is None:
+        return None  # An idle train never fetches a passenger from another station
+    return asked['estimate'], asked['passenger'].arrival_time
+
+def test_reported_case():
+    train_system = TrainSystem(['A', 'B', 'C', 'D'], verbose=False)
+    train_system.add_passenger_request(Passenger('A', 'D', 1))
+    passenger = Passenger('B', 'C', 1)
+    train_system.add_passenger_request(passenger)
+    process_boarding = train_system.process_boarding
+    estimates = []
+
+    def asking_boarding():
+        process_boarding()
+        if train_system.current_time == 2 and not estimates:
+            estimates.append(train_system.estimate_arrival('B', 'C'))
+
+    train_system.process_boarding = asking_boarding
+    train_system.run()
+    assert estimates == [5] == [passenger.arrival_time]
+
+def test_estimates_match_a_forward_run():
+    checked = 0
+    for seed in range(2000):
+        outcome = estimate_and_run(seed)
+        if outcome is not None:
+            estimate, arrival = outcome
+            assert estimate == arrival, f"seed {seed}: estimated {estimate}, arrived {arrival}"
+            checked += 1
+    assert checked > 150
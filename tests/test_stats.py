@@ -0,0 +1,12 @@
+from lab7.stats import percentile, summarize
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile(values, 1.0) == 100
+    assert percentile([7], 0.99) == 7
+    assert percentile([], 0.5) is None
+
+def test_summarize_empty():
+    assert summarize([]) == {'count': 0, 'mean': None, 'p50': None, 'p99': None, 'max': None}
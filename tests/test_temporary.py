@@ -0,0 +1,40 @@
+import contextlib
+import io
+import random
+
+import temporary
+
+def run_batch(train_system, cycles):
+    # Simulate quietly, recording every passenger each time they alight
+    delivered = []
+    alight_riders = train_system.alight_riders
+
+    def recording_alight(station):
+        delivered.extend(train_system.riders[station])
+        alight_riders(station)
+
+    train_system.alight_riders = recording_alight
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(cycles):
+            train_system.simulate_cycle()
+    return delivered
+
+def test_batch_trip_passenger_is_delivered_once():
+    train_system = temporary.TrainSystem(['A', 'B', 'C', 'D'], service_mode='batch')
+    train_system.generate_new_passengers = lambda: None
+    passenger = temporary.Passenger('B', 'D', 0)
+    train_system.passengers.append(passenger)
+    train_system.waiting['B']['D'].append(passenger)
+    delivered = run_batch(train_system, 1)
+    assert delivered == [passenger]
+    assert train_system.total_passengers == 1
+    assert train_system.total_travel_time == 2
+
+def test_batch_delivers_every_passenger_at_most_once():
+    for seed in range(20):
+        random.seed(seed)
+        train_system = temporary.TrainSystem(['A', 'B', 'C', 'D', 'E'], service_mode='batch')
+        delivered = run_batch(train_system, 30)
+        assert len(delivered) == len(set(map(id, delivered))) == train_system.total_passengers
+        for passenger in delivered:
+            assert passenger.dropoff_time >= passenger.pickup_time >= passenger.request_time